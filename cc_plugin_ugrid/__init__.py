@@ -1,6 +1,9 @@
 """Ugrid Checker."""
 
+import functools
 import logging
+import typing
+from dataclasses import dataclass
 
 from compliance_checker.base import BaseNCCheck, Result
 
@@ -17,6 +20,93 @@ class UgridExceptionError(Exception):  # noqa: D101
     pass
 
 
+_COORDINATE_ATTRS = ("node_coordinates", "edge_coordinates", "face_coordinates")
+
+
+def _split_coordinate_names(value):
+    """Split a whitespace-separated *_coordinates attribute into a tuple of variable names.
+
+    Anything other than a string (e.g. a malformed numeric attribute) is
+    treated as no coordinates and gives None.
+    """
+    if isinstance(value, str):
+        return tuple(value.split())
+    return None
+
+
+def _split_coordinates(attrs):
+    """Split the *_coordinates attributes present in attrs, see _split_coordinate_names."""
+    return {name: _split_coordinate_names(attrs[name]) for name in _COORDINATE_ATTRS if name in attrs}
+
+
+@dataclass
+class MeshView:
+    """Snapshot of the attributes of a mesh variable, read once in setup.
+
+    :param dict attrs : attribute name -> value
+    :param dict coords: *_coordinates attribute name -> tuple of variable names
+    """
+
+    __slots__ = ("attrs", "coords")
+
+    attrs: dict
+    coords: dict
+
+    @classmethod
+    def from_mesh(cls, mesh):
+        """Read the attributes of a netCDF4 mesh variable."""
+        attrs = {name: mesh.getncattr(name) for name in mesh.ncattrs()}
+        return cls(attrs, _split_coordinates(attrs))
+
+
+def _memoize_check(func):
+    """Cache the result of a check per mesh (and extra arguments) for the duration of check_run.
+
+    Outside check_run there is no cache and the check is always evaluated.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self, mesh, *args):
+        cache = self._results_cache
+        if cache is None:
+            return func(self, mesh, *args)
+        key = (id(mesh), func.__name__, *args)
+        if key in cache:
+            return cache[key]
+        result = func(self, mesh, *args)
+        cache[key] = result
+        return result
+
+    return wrapper
+
+
+def check_method(order, requires=()):
+    """Register a UgridChecker method as a check to run on every mesh.
+
+    The check is also memoized, see _memoize_check. A check with requires
+    is called with the keyword failed_requirement: the result of the first
+    required check that failed on the mesh, or None.
+
+    :param int order      : position of the check within a run
+    :param tuple requires : orders of the checks this check depends on
+    """
+    requires = tuple(requires)
+
+    def decorator(func):
+        check = func
+        if requires:
+
+            @functools.wraps(func)
+            def check(self, mesh):
+                return func(self, mesh, failed_requirement=self._failed_requirement(mesh, requires))
+
+        wrapper = _memoize_check(check)
+        wrapper.ugrid_check = (order, requires)
+        return wrapper
+
+    return decorator
+
+
 class UgridChecker(BaseNCCheck):
     """Ugrid Checker."""
 
@@ -25,6 +115,48 @@ class UgridChecker(BaseNCCheck):
     _cc_author = "Brian McKenna <brian.mckenna@rpsgroup.com>"
     _cc_checker_version = __version__
 
+    # (order, name, requires) of the registered checks, sorted by order
+    _CHECKS: typing.ClassVar = ()
+    # order -> name of the registered checks
+    _CHECK_NAMES: typing.ClassVar = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Build the table of checks registered with check_method."""
+        super().__init_subclass__(**kwargs)
+        checks = []
+        for name in dir(cls):
+            spec = getattr(getattr(cls, name), "ugrid_check", None)
+            if spec is not None:
+                order, requires = spec
+                checks.append((order, name, requires))
+        cls._CHECKS = tuple(sorted(checks))
+        cls._CHECK_NAMES = {}
+        for order, name, _ in cls._CHECKS:
+            if order in cls._CHECK_NAMES:
+                msg = f"{name} and {cls._CHECK_NAMES[order]} are both registered with order {order}"
+                raise UgridExceptionError(msg)
+            cls._CHECK_NAMES[order] = name
+        for _, name, requires in cls._CHECKS:
+            unknown = set(requires) - set(cls._CHECK_NAMES)
+            if unknown:
+                msg = f"{name} requires unregistered check order(s) {sorted(unknown)}"
+                raise UgridExceptionError(msg)
+
+    def _failed_requirement(self, mesh, requires):
+        """Return the result of the first required check that failed on mesh, or None.
+
+        The checks are memoized, so within a run this reuses their results.
+
+        :param netCDF4 variable mesh: mesh variable
+        :param tuple requires       : orders of the required checks
+        """
+        for order in requires:
+            result = getattr(self, self._CHECK_NAMES[order])(mesh)
+            score, out_of = result.value
+            if score < out_of:
+                return result
+        return None
+
     @classmethod
     def beliefs(cls):
         """Beliefs."""
@@ -51,14 +183,24 @@ class UgridChecker(BaseNCCheck):
 
         """
         self.ds = ds
-        self.meshes = {
-            m: {}
+        # check results are only memoized while check_run is running
+        self._results_cache = None
+        # plain dict snapshots of the dataset's variables and dimensions;
+        # indexing the netCDF4 mappings goes through the C library each time
+        self._vars = dict(self.ds.variables)
+        self._dims = dict(self.ds.dimensions)
+        self._dim_lens = {name: dim.size for name, dim in self._dims.items()}
+        # every attribute of each mesh is read once here; the checks read
+        # these views only, so call setup again after changing a mesh
+        self._mesh_views = {
+            m: MeshView.from_mesh(m)
             for m in self.ds.get_variables_by_attributes(
                 cf_role="mesh_topology",
             )
         }
+        self.meshes = {m: {} for m in self._mesh_views}
 
-        for mesh in self.meshes:
+        for mesh, view in self._mesh_views.items():
             for att in (
                 "boundary_node_coordinates",
                 "edge_coordinates",
@@ -82,7 +224,4 @@ class UgridChecker(BaseNCCheck):
                 "volume_shape_type",
                 "volume_volume_connectivity",
             ):
-                if hasattr(mesh, att):
-                    self.meshes[mesh][att] = mesh.getncattr(att)
-                else:
-                    self.meshes[mesh][att] = None
+                self.meshes[mesh][att] = view.attrs.get(att)
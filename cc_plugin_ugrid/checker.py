@@ -5,7 +5,10 @@ import typing
 
 from compliance_checker.base import BaseCheck
 
-from cc_plugin_ugrid import UgridChecker
+from cc_plugin_ugrid import UgridChecker, _memoize_check, check_method
+
+_METHODS_RE = re.compile(r"(\w+: *\w+) \((\w+: *\w+)\) *")
+_PADDING_TYPES = frozenset(("none", "low", "high", "both"))
 
 
 class UgridChecker(UgridChecker):
@@ -19,12 +22,27 @@ class UgridChecker(UgridChecker):
         1: "Suggested",
     }
 
-    METHODS_REGEX = re.compile(r"(\w+: *\w+) \((\w+: *\w+)\) *")
-    PADDING_TYPES = ("none", "low", "high", "both")
+    METHODS_REGEX = _METHODS_RE
+    PADDING_TYPES = _PADDING_TYPES
+
+    # topology dimension -> connectivity the mesh must have
+    _REQUIRED_CONN_FOR_DIM: typing.ClassVar = {
+        1: "edge_node_connectivity",
+        2: "face_node_connectivity",
+        3: "volume_node_connectivity",
+    }
+
+    # connectivity type -> (name of the element dimension, number of nodes per element)
+    _DIM_RULES: typing.ClassVar = {
+        "edge_node_connectivity": ("nedges", 2),
+        "face_node_connectivity": ("nfaces", 3),
+    }
 
     def __init__(self):
-        pass
+        # only set while check_run is running
+        self._results_cache = None
 
+    @check_method(order=1)
     def _check1_topology_dim(self, mesh):
         """Check the dimension of the mesh topology is valid.
 
@@ -35,20 +53,21 @@ class UgridChecker(UgridChecker):
         out_of = 1
         messages = []
         desc = "The topology dimension is the highest dimension of the data"
+        meta = self.meshes[mesh]
 
-        if not self.meshes[mesh]["topology_dimension"]:
+        if meta["topology_dimension"] is None:
             m = 'Mesh does not contain the required attribute "topology_dimension"'
             messages.append(m)
-
-        if self.meshes[mesh]["topology_dimension"] not in (1, 2, 3):
-            m = f'Invalid topology_dimension "{self.meshes[mesh]["topology_dimension"]}" of type "{type(self.meshes[mesh]["topology_dimension"])}"'
+        elif meta["topology_dimension"] not in (1, 2, 3):
+            m = f'Invalid topology_dimension "{meta["topology_dimension"]}" of type "{type(meta["topology_dimension"])}"'
             messages.append(m)
         else:
             score += 1
 
         return self.make_result(level, score, out_of, desc, messages)
 
-    def _check2_connectivity_attrs(self, mesh):
+    @check_method(order=2, requires=(1,))
+    def _check2_connectivity_attrs(self, mesh, failed_requirement=None):
         """Check the connecivity attributes of a given mesh.
 
         Dependent on the existence of topology_dimension attribute.
@@ -56,6 +75,7 @@ class UgridChecker(UgridChecker):
         connectivity attributes.
 
         :param NetCDF4 variable mesh
+        :param Result failed_requirement: failed required check, set by check_method
 
         Notes
         -----
@@ -76,30 +96,31 @@ class UgridChecker(UgridChecker):
         messages = []
 
         desc = "Interconnectivity: connection between elements in the mesh"
+        meta = self.meshes[mesh]
 
-        if not self.meshes[mesh]["topology_dimension"]:
-            m = 'Mesh does not contain the required attribute "topology_dimension", therefore any defined connectivity cannot be verified.'
+        if failed_requirement is not None:
+            m = 'Mesh does not contain a valid "topology_dimension", therefore any defined connectivity cannot be verified.'
             messages.append(m)
             out_of += 1
             return self.make_result(level, score, out_of, desc, messages)
 
         # verify that at least the requirements are met
-        conns = [
+        _dim = meta["topology_dimension"]
+        _required = self._REQUIRED_CONN_FOR_DIM.get(_dim)
+        if _required and not meta[_required]:
+            out_of += 1  # increment out_of, do not increment score
+            m = f'dataset is {_dim}D, so must have "{_required}"'
+            messages.append(m)
+            return self.make_result(level, score, out_of, desc, messages)
+
+        # now we test individual connectivities -- here we will be incrementing the score
+        conns = (
             "edge_node_connectivity",
             "face_node_connectivity",
             "volume_node_connectivity",
-        ]
-        dims = [1, 2, 3]
-
-        for _dim, _conn in zip(dims, conns):
-            if (not self.meshes[mesh][_conn]) and (self.meshes[mesh]["topology_dimension"] == _dim):
-                out_of += 1  # increment out_of, do not increment score
-                m = f'dataset is {_dim}D, so must have "{_conn}"'
-                return self.make_result(level, score, out_of, desc, messages)
-
-        # now we test individual connectivities -- here we will be incrementing the score
+        )
         for _conn in conns:
-            if self.meshes[mesh][_conn]:
+            if meta[_conn]:
                 # validate the expected attributes match
                 out_of += 1
                 valid, order = self._validate_nc_shape(mesh, _conn)
@@ -120,12 +141,14 @@ class UgridChecker(UgridChecker):
 
         return self.make_result(level, score, out_of, desc, messages)
 
-    def _check3_ncoords_exist(self, mesh):
+    @check_method(order=3, requires=(1,))
+    def _check3_ncoords_exist(self, mesh, failed_requirement=None):
         """Check node coordinates in a given mesh variable.
 
-        Dependent on _check1_topology_dim, _check2_connectivity_attrs.
+        Dependent on _check1_topology_dim.
 
-        :param netCDF4 variable mesh: the mesh variable
+        :param netCDF4 variable mesh   : the mesh variable
+        :param Result failed_requirement: failed required check, set by check_method
 
         Notes
         -----
@@ -141,39 +164,41 @@ class UgridChecker(UgridChecker):
         score = 0
         out_of = 0
         messages = []
-        desc = "Node coordinates point to aux coordinate variables representing" + " locations of nodes"
+        desc = "Node coordinates point to aux coordinate variables representing locations of nodes"
+        meta = self.meshes[mesh]
 
-        self.meshes[mesh]["node_coordinates"] = []
-        if not self.meshes[mesh].get("topology_dimension"):
-            msg = "Failed because no topology dimension exists"
+        # node coordinates named by the mesh but missing from the variables
+        missing = meta["node_coordinates"] = []
+        if failed_requirement is not None:
+            msg = "Failed because no valid topology dimension exists"
             messages.append(msg)
             out_of += 1
             return self.make_result(level, score, out_of, desc, messages)
-        try:
-            ncoords = mesh.node_coordinates.split(" ")
-            if len(ncoords) == self.meshes[mesh].get("topology_dimension"):
-                for nc in ncoords:
-                    out_of += 1
-                    if nc not in self.ds.variables:
-                        self.meshes[mesh]["node_coordinates"].append(nc)
-                        msg = f'Node coordinate "{nc}" in mesh but not in variables'
-                        messages.append(msg)
-                    else:
-                        score += 1
-            else:
-                msg = "The size of mesh's node coordinates does not match" + " the topology dimension ({})".format(
-                    self.meshes[mesh].get("topology_dimension"),
-                )
-                out_of += 1
-                messages.append(msg)
 
-        except AttributeError:
+        ncoords = self._mesh_coords(mesh, "node_coordinates")
+        if ncoords is None:
             msg = "This mesh has no node coordinate variables"
             out_of += 1
             messages.append(msg)
+            return self.make_result(level, score, out_of, desc, messages)
+
+        if len(ncoords) == meta.get("topology_dimension"):
+            for nc in ncoords:
+                out_of += 1
+                if nc not in self._vars:
+                    missing.append(nc)
+                    msg = f'Node coordinate "{nc}" in mesh but not in variables'
+                    messages.append(msg)
+                else:
+                    score += 1
+        else:
+            msg = f"The size of mesh's node coordinates does not match the topology dimension ({meta.get('topology_dimension')})"
+            out_of += 1
+            messages.append(msg)
 
         return self.make_result(level, score, out_of, desc, messages)
 
+    @check_method(order=4)
     def _check4_edge_face_conn(self, mesh):
         """Check edge_face_connectivity.
 
@@ -193,20 +218,22 @@ class UgridChecker(UgridChecker):
         out_of = 0
         messages = []
         desc = "array of faces sharing the same edge (optional)"
+        meta = self.meshes[mesh]
 
-        if (not self.meshes[mesh]["nedges"]) or (not self.meshes[mesh]["nfaces"]):
+        if (not meta["nedges"]) or (not meta["nfaces"]):
             return self.make_result(level, score, out_of, desc, messages)
 
-        try:
-            efc = mesh.getncattr("edge_face_connectivity")
-            out_of += 1
-        except AttributeError:
+        efc = self._mesh_attr(mesh, "edge_face_connectivity")
+        if efc is None:
             messages.append("No edge_face_connectivity (optional)")
             return self.make_result(level, score, out_of, desc, messages)
+        out_of += 1
         # check if efc has the right shape
-        dim1, dim2 = self.ds.variables[efc].shape  # unpack the tuple
+        d1name, d2name = self._vars[efc].dimensions  # unpack the tuple
+        dim1 = self._dim_lens[d1name]
+        dim2 = self._dim_lens[d2name]
         # compare to nedges or # should be equal to 2
-        if dim1 != self.meshes[mesh]["nedges"].size or dim2 != 2:
+        if dim1 != self._dim_lens[meta["nedges"].name] or dim2 != 2:
             messages.append(
                 f"Incorrect shape ({dim1}, {dim2}) of edge_face_connectivity array",
             )
@@ -215,6 +242,7 @@ class UgridChecker(UgridChecker):
 
         return self.make_result(level, score, out_of, desc, messages)
 
+    @check_method(order=5)
     def _check5_face_edge_conn(self, mesh):
         """Check face_edge_connectivity.
 
@@ -236,18 +264,17 @@ class UgridChecker(UgridChecker):
         messages = []
         desc = "array pointing to every index of each edge of each face (optional)"
 
-        valid, _out_of, msg = self.__check_fec_ffc__(
-            mesh,
-            "face_edge_connectivity",
-        )
+        valid, _out_of, msg = self.__check_fec_and_ffc__(mesh)[0]
         out_of += _out_of
-        messages.append(msg)
+        if msg:
+            messages.append(msg)
 
         if valid:
             score += 1
 
         return self.make_result(level, score, out_of, desc, messages)
 
+    @check_method(order=6)
     def _check6_face_face_conn(self, mesh):
         """Check face_face_connectivity.
 
@@ -265,12 +292,10 @@ class UgridChecker(UgridChecker):
         messages = []
         desc = "array of every face sharing a face with any other face (optional)"
 
-        valid, _out_of, msg = self.__check_fec_ffc__(
-            mesh,
-            "face_face_connectivity",
-        )
+        valid, _out_of, msg = self.__check_fec_and_ffc__(mesh)[1]
         out_of += _out_of
-        messages.append(msg)
+        if msg:
+            messages.append(msg)
 
         if valid:
             score += 1
@@ -308,21 +333,47 @@ class UgridChecker(UgridChecker):
         ret_vals = []
         if self.meshes:
             score += 1
-            for mesh in self.meshes:
-                for _, check in self.yield_checks():
-                    _ = check(mesh)
-                    ret_vals.append(check(mesh))
+            meshes = self.meshes
+            # check results are memoized for this run only
+            self._results_cache = {}
+            try:
+                for mesh in meshes:
+                    for _, check in self.yield_checks():
+                        ret_vals.append(check(mesh))
+            finally:
+                self._results_cache = None
         else:
             msg = "No mesh variables are detected in the data; all checks fail."
             messages.append(msg)
         ret_vals.append(self.make_result(level, score, out_of, desc, messages))
         return ret_vals
 
+    def _mesh_attr(self, mesh, name):
+        """Return an attribute of a mesh variable, or None if it does not have it.
+
+        Reads the MeshView taken in setup; call setup again after changing
+        the attributes of a mesh.
+
+        :param netCDF4 variable mesh: mesh variable
+        :param str name             : attribute name
+        """
+        return self._mesh_views[mesh].attrs.get(name)
+
+    def _mesh_coords(self, mesh, attr):
+        """Return the variable names listed in a *_coordinates attribute of a mesh.
+
+        :param netCDF4 variable mesh: mesh variable
+        :param str attr             : one of node_coordinates, edge_coordinates
+                                      or face_coordinates
+
+        :returns tuple of str, or None if the mesh does not have the attribute
+        """
+        return self._mesh_views[mesh].coords.get(attr)
+
     def yield_checks(self):
         """Iterate checks."""
-        for name in sorted(dir(self)):
-            if name.startswith("_check"):
-                yield name, getattr(self, name)
+        for _, name, _ in self._CHECKS:
+            yield name, getattr(self, name)
 
     def __check_edge_face_coords__(self, mesh, cty):
         """Check the edge[face] coordinates of a given mesh.
@@ -352,6 +403,7 @@ class UgridChecker(UgridChecker):
         out_of = 1
         messages = []
         desc = "Edge coordinates point to aux coordinate variables representing locations of edges (usually midpoint)"
+        meta = self.meshes[mesh]
 
         coordmap = {
             "edge_node_connectivity": "edge_coordinates",
@@ -364,22 +416,21 @@ class UgridChecker(UgridChecker):
         }
 
         # do(es) the mesh(es) have appropriate connectivity? If not, pass
-        if not self.meshes[mesh][cty]:
+        if not meta[cty]:
             messages.append(f"No {cty}?")
             return self.make_result(level, score, out_of, desc, messages)
 
         # first ensure the _coordinates variable exists
         _c = coordmap[cty]
-        try:
-            coords = mesh.getncattr(_c)
-        except AttributeError:
+        coords = self._mesh_coords(mesh, _c)
+        if coords is None:
             messages.append("Optional attribute, not required")
             return self.make_result(level, score, out_of, desc, messages)
 
         # if it exists, verify its length is equivalent to nedges
-        for coord in coords.split(" "):  # split the string
-            _coord_len = len(self.ds.variables[coord])
-            _dim_len = len(self.ds.dimensions[varmap[_c]])
+        _dim_len = self._dim_lens[varmap[_c]]
+        for coord in coords:
+            _coord_len = self._vars[coord].shape[0]
             if _coord_len != _dim_len:
                 m = f"{_c} should have length of {varmap[_c]}"
                 messages.append(m)
@@ -388,49 +439,48 @@ class UgridChecker(UgridChecker):
 
         return self.make_result(level, score, out_of, desc, messages)
 
-    def __check_fec_ffc__(self, mesh, cty):
-        """Check for the optional variable/attribute.
+    @_memoize_check
+    def __check_fec_and_ffc__(self, mesh):
+        """Check for the optional face_edge_connectivity and face_face_connectivity.
 
-        Check for the optional of face_edge_connectivity orface_face_connectivity
-        and verifies the shape.
+        Both arrays should have shape (nFaces x MaxNumNodesPerFace), so the
+        dimensions are looked up once and the shape of each array is verified.
 
         :param netCDF4 variable mesh: mesh variable
-        :param str cty              : connectivity type; one of face_edge or
-                                      face_face_connectivity
 
-        :returns bool, int, str
+        :returns (bool, int, str) for face_edge_connectivity and for
+                 face_face_connectivity
         """
         # NB: check for start_index, _FillValue?
 
-        valid = False
-        _out_of = 0
-        m = ""
-
-        try:
-            mnpf = self.ds.dimensions.get("maxnumnodesperface")
-        except AttributeError:  # skip
-            return valid, _out_of, ""
-
-        if not self.meshes[mesh]["nfaces"]:
-            m += "Number of faces (nfaces) not defined"
-            return valid, _out_of, m
-
-        try:
-            _c = mesh.getncattr(cty)
-            _out_of += 1
-        except AttributeError:
-            m += f"No {cty} (optional)"
-            return valid, _out_of, m
-
-        # check if right shape
-        dim1, dim2 = self.ds.variables[_c].shape  # unpack the tuple
-        # compare to nfaces
-        if dim1 != self.meshes[mesh]["nfaces"].size or dim2 != mnpf.size:
-            m += f"Incorrect shape ({dim1}, {dim2}) of {cty} array"
-        else:
-            valid = True
+        nfaces = self.meshes[mesh]["nfaces"]
+        if not nfaces:
+            m = "Number of faces (nfaces) not defined"
+            return (False, 0, m), (False, 0, m)
+        nfaces = self._dim_lens[nfaces.name]
+
+        mnpf = self._dim_lens.get("maxnumnodesperface")
+        if mnpf is None:  # skip
+            return (False, 0, ""), (False, 0, "")
+
+        results = []
+        for cty in ("face_edge_connectivity", "face_face_connectivity"):
+            _c = self._mesh_attr(mesh, cty)
+            if _c is None:
+                results.append((False, 0, f"No {cty} (optional)"))
+                continue
+
+            # check if right shape
+            d1name, d2name = self._vars[_c].dimensions  # unpack the tuple
+            dim1 = self._dim_lens[d1name]
+            dim2 = self._dim_lens[d2name]
+            # compare to nfaces
+            if dim1 != nfaces or dim2 != mnpf:
+                results.append((False, 1, f"Incorrect shape ({dim1}, {dim2}) of {cty} array"))
+            else:
+                results.append((True, 1, ""))
 
-        return valid, _out_of, m
+        return tuple(results)
 
     def __check_nonstd_order_dims__(self, mesh, cty):
         """Check nonstd order dims.
@@ -484,18 +534,19 @@ class UgridChecker(UgridChecker):
         # TODO: Find an example of non-standard face_edge_connectivity
 
         """
-        try:
-            # assign the value of *_dimension, as described above
-            self.meshes[mesh][dim_var] = self.ds.dimensions[mesh.getncattr(dim_var)]
-        except AttributeError:
+        dim_name = self._mesh_attr(mesh, dim_var)
+        if dim_name is None:
             msg = f"Mesh does not contain {dim_var}, required when connectivity in non-standard order."
             return False, msg
-        except KeyError:
+        dim = self._dims.get(dim_name)
+        if dim is None:
             msg = "Edge dimension defined in mesh, not defined in dataset dimensions."
             return False, msg
-        else:
-            return True, None
+        # assign the value of *_dimension, as described above
+        self.meshes[mesh][dim_var] = dim
+        return True, None
 
+    @_memoize_check
     def _validate_nc_shape(self, mesh, cty):
         """Validate shape of the nc object.
 
@@ -516,47 +567,42 @@ class UgridChecker(UgridChecker):
 
         :returns bool: indicator if valid shape and if 'regular' ordering
         """
-        try:
-            if cty not in (
-                "edge_node_connectivity",
-                "face_node_connectivity",
-                "volume_node_connectivity",
-            ):
-                return False, None  # should never get this, right?
-            conn_array_name = mesh.getncattr(cty)
-        except AttributeError:
+        meta = self.meshes[mesh]
+        if cty not in (
+            "edge_node_connectivity",
+            "face_node_connectivity",
+            "volume_node_connectivity",
+        ):
+            return False, None  # should never get this, right?
+        conn_array_name = self._mesh_attr(mesh, cty)
+        if conn_array_name is None:
             return False, None
 
         # use name of array to get that variable from the dataset
-        _array = self.ds.variables.get(conn_array_name)
+        _array = self._vars.get(conn_array_name)
         _d1name, _d2name = _array.dimensions  # tuple of strings
-        dim1 = self.ds.dimensions[_d1name]  # access the dimension objects
-        dim2 = self.ds.dimensions[_d2name]
 
         # check against dimensions of dataset
-        if dim1.name not in self.ds.dimensions or dim2.name not in self.ds.dimensions:
+        if _d1name not in self._dims or _d2name not in self._dims:
             return False, None
+        dim1_size = self._dim_lens[_d1name]
+        dim2_size = self._dim_lens[_d2name]
 
         # determine ordering
-        # NOTE how I check dim2.size; if dim2 does happen to be the "3" variable,
+        # NOTE how I check dim2_size; if dim2 does happen to be the "3" variable,
         # it could be called literally whatever the modeler wants. What's important is
         # the size. This could be said for the n(Edges)Faces dimension, but this is not
         # assumed as some sort of standard must be applied
 
-        if cty == "edge_node_connectivity":
-            _dim1 = "nedges"
-            _dim2size = 2
-        elif cty == "face_node_connectivity":
-            _dim1 = "nfaces"
-            _dim2size = 3
-        else:
+        if cty not in self._DIM_RULES:
             raise NotImplementedError  # haven't dealt with real 3D grids yet
+        _dim1, _dim2size = self._DIM_RULES[cty]
 
-        if (dim1.name == _dim1) and (dim2.size == _dim2size):
+        if (_d1name == _dim1) and (dim2_size == _dim2size):
             # set the attr in the meshes dict
-            self.meshes[mesh][_dim1] = self.ds.dimensions[_dim1]
+            meta[_dim1] = self._dims[_dim1]
             return True, "regular"
-        if (dim1.size == _dim2size) and (dim2.name == _dim1):
-            self.meshes[mesh][_dim1] = self.ds.dimensions[_dim1]
+        if (dim1_size == _dim2size) and (_d2name == _dim1):
+            meta[_dim1] = self._dims[_dim1]
             return True, "nonstd"
         return False, None
@@ -3,10 +3,11 @@
 import logging
 from pathlib import Path
 
+import numpy as np
 import pytest
 from netCDF4 import Dataset
 
-from cc_plugin_ugrid import logger
+from cc_plugin_ugrid import UgridExceptionError, check_method, logger
 from cc_plugin_ugrid.checker import UgridChecker
 
 logger.addHandler(logging.NullHandler())
@@ -14,6 +15,7 @@ logger.addHandler(logging.StreamHandler())
 logger.setLevel(logging.DEBUG)
 
 ugridnc = Path(__file__).absolute().parent.parent.joinpath("resources", "ugrid.nc")
+adcircnc = Path(__file__).absolute().parent.parent.joinpath("resources", "adcirc.nc4")
 
 
 @pytest.fixture
@@ -58,6 +60,26 @@ def test_expected_pass(checker):
         assert r.value[0] == r.value[1]
 
 
+def test_expected_pass_no_messages(checker):
+    """Checks that pass should not report any messages.
+
+    _check6_face_face_conn is left out: ugrid.nc has no face_face_connectivity,
+    so that check passes with a message noting the optional attribute is absent.
+    """
+    for mt in checker.meshes:
+        # in run order, so _check2 defines nedges/nfaces for _check4 and _check5
+        for check in (
+            checker._check1_topology_dim,
+            checker._check2_connectivity_attrs,
+            checker._check3_ncoords_exist,
+            checker._check4_edge_face_conn,
+            checker._check5_face_edge_conn,
+        ):
+            r = check(mt)
+            assert r.value[0] == r.value[1]
+            assert r.msgs == []
+
+
 # testing for correct failure behavior
 def test_fail_check1_topology_dim(checker):
     """Test that _check1_topology_dim fails without the wrong variable and without a topology variable."""
@@ -74,6 +96,15 @@ def test_fail_check1_topology_dim(checker):
         assert r.value[0] != r.value[1]
 
 
+def test_fail_check1_topology_dim_missing(checker):
+    """A missing topology_dimension is reported once, not also as invalid."""
+    for mt in checker.meshes:
+        checker.meshes[mt]["topology_dimension"] = None
+        r = checker._check1_topology_dim(mt)
+        assert r.value[0] != r.value[1]
+        assert len(r.msgs) == 1
+
+
 def test_fail_check2_connectivity_attrs(checker):
     """Test _check2_connectivity_attrs fails when the given topology dimensions do not match."""
     for mesh in checker.meshes:
@@ -84,11 +115,31 @@ def test_fail_check2_connectivity_attrs(checker):
         assert r.value[0] != r.value[1]
 
 
+def test_fail_check2_connectivity_attrs_bad_topology_dim(checker):
+    """_check2_connectivity_attrs is skipped when _check1_topology_dim failed."""
+    for mesh in checker.meshes:
+        checker.meshes[mesh]["topology_dimension"] = "NotMyProblem"
+        r = checker._check2_connectivity_attrs(mesh)
+        assert r.value == (0, 1)
+
+
+def test_fail_check2_connectivity_attrs_missing_required(checker):
+    """A 2D mesh without face_node_connectivity reports the missing requirement."""
+    for mesh in checker.meshes:
+        checker.meshes[mesh]["face_node_connectivity"] = None
+        r = checker._check2_connectivity_attrs(mesh)
+        assert r.value == (0, 1)
+        assert r.msgs == ['dataset is 2D, so must have "face_node_connectivity"']
+
+
 def test_fail_check2_connectivity_attrs_bad_point(checker):
     """Change the array the connectivity points to something else."""
     for mesh in checker.meshes:
         mesh.setncattr("edge_node_connectivity", "fec")
         mesh.setncattr("face_node_connectivity", "fec")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         r = checker._check2_connectivity_attrs(mesh)
         assert r.value[0] != r.value[1]
 
@@ -102,6 +153,9 @@ def test_fail_check_edge_face_coords(checker):
         # change the face_coordinates variable; this essentially
         #   changes the lengths of the vars
         mesh.setncattr("face_coordinates", "lon lat")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         r = checker.__check_edge_face_coords__(
             mesh,
             "face_node_connectivity",
@@ -117,6 +171,9 @@ def test_fail_check_nonstd_order_dims(checker):
     for mesh in checker.meshes:
         # remove edge_dimension
         mesh.delncattr("edge_dimension")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         r = checker.__check_nonstd_order_dims__(
             mesh,
             "edge_node_connectivity",
@@ -128,6 +185,9 @@ def test_fail_check_nonstd_order_dims_no_face_dim(checker):
     """Remove face_dimension."""
     for mesh in checker.meshes:
         mesh.delncattr("face_dimension")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         r = checker.__check_nonstd_order_dims__(
             mesh,
             "face_node_connectivity",
@@ -148,6 +208,9 @@ def test_fail_check3_ncoords_exist_no_node_coords(checker):
     """Remove node coordinates."""
     for mesh in checker.meshes:
         del mesh.node_coordinates
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         r = checker._check3_ncoords_exist(mesh)
         assert r.value[0] != r.value[1]
 
@@ -156,21 +219,72 @@ def test_fail_check3_ncoords_exist_diff_arr_len(checker):
     """Change the array length (2 to 3)."""
     for mesh in checker.meshes:
         mesh.setncattr("node_coordinates", "['lat', 'lon', 'both']")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         r = checker._check3_ncoords_exist(mesh)
         assert r.value[0] != r.value[1]
 
     # change the vars themselves
     for mesh in checker.meshes:
         mesh.setncattr("node_coordinates", "['notacoord', 'nope']")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         r = checker._check3_ncoords_exist(mesh)
         assert r.value[0] != r.value[1]
 
 
+def test_check3_ncoords_exist_extra_whitespace(checker, run_checks):
+    """Runs of spaces or tabs between node coordinates are a single separator."""
+    for mesh in checker.meshes:
+        mesh.setncattr("node_coordinates", "lon  \tlat ")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
+        r = checker._check3_ncoords_exist(mesh)
+        assert r.value == (2, 2)
+
+    ncoords_results = [r for r in run_checks(checker._check3_ncoords_exist) if r.name.startswith("Node coordinates")]
+    assert len(ncoords_results) == len(checker.meshes)
+    assert all(r.value == (2, 2) for r in ncoords_results)
+
+
+def test_fail_check3_ncoords_exist_unknown_vars_in_run(checker, run_checks):
+    """check_run and a direct call read the same snapshot of the mesh attributes."""
+    for mesh in checker.meshes:
+        mesh.setncattr("node_coordinates", "nope1 nope2")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    direct = [checker._check3_ncoords_exist(mesh).value for mesh in checker.meshes]
+    ncoords_results = [r for r in run_checks(checker._check3_ncoords_exist) if r.name.startswith("Node coordinates")]
+    assert [r.value for r in ncoords_results] == direct
+    assert all(value == (0, 2) for value in direct)
+
+
+def test_fail_check3_ncoords_exist_not_a_string(checker, run_checks):
+    """A numeric node_coordinates fails _check3 cleanly instead of raising."""
+    for mesh in checker.meshes:
+        mesh.setncattr("node_coordinates", np.int32(5))
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
+        r = checker._check3_ncoords_exist(mesh)
+        assert r.value == (0, 1)
+
+    ncoords_results = [r for r in run_checks(checker._check3_ncoords_exist) if r.name.startswith("Node coordinates")]
+    assert len(ncoords_results) == len(checker.meshes)
+    assert all(r.value == (0, 1) for r in ncoords_results)
+
+
 def test_fail_check4_edge_face_conn(checker):
     """Fail the edge_face_connectivity check."""
     for mesh in checker.meshes:
         # change the edge_face_connectivity array
         mesh.setncattr("edge_face_connectivity", "nv")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         checker._check2_connectivity_attrs(mesh)  # run the dependency
         r = checker._check4_edge_face_conn(mesh)
         assert r.value[0] != r.value[1]
@@ -181,6 +295,9 @@ def test_fail_check5_face_edge_conn(checker):
     for mesh in checker.meshes:
         # change the face_edge_connectivity array
         mesh.setncattr("face_edge_connectivity", "nv")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         checker._check2_connectivity_attrs(mesh)  # run the dependency
         r = checker._check5_face_edge_conn(mesh)
         assert r.value[0] != r.value[1]
@@ -191,6 +308,126 @@ def test_fail_check6_face_face_conn(checker):
     for mesh in checker.meshes:
         # change the face_face_connectivity array
         mesh.setncattr("face_face_connectivity", "nv")
+    checker.setup(checker.ds)  # re-read the mesh attributes
+
+    for mesh in checker.meshes:
         checker._check2_connectivity_attrs(mesh)  # run the dependency
         r = checker._check6_face_face_conn(mesh)
         assert r.value[0] != r.value[1]
+
+
+@pytest.fixture
+def run_checks(checker, monkeypatch):
+    """Run check_run with the given callables in place of the registered checks."""
+
+    def run(*checks):
+        monkeypatch.setattr(checker, "yield_checks", lambda: ((c.__name__, c) for c in checks))
+        return checker.check_run(checker.ds)
+
+    return run
+
+
+def test_check_run_calls_each_check_once(checker, run_checks):
+    """check_run calls every check once per mesh, and repeated checks within the run reuse the cached result."""
+    calls = []
+    cached = []
+
+    def check_twice(mesh):
+        calls.append(mesh)
+        r = checker._check1_topology_dim(mesh)
+        cached.append(checker._check1_topology_dim(mesh) is r)
+        return r
+
+    ret_vals = run_checks(check_twice)
+    assert calls == list(checker.meshes)
+    assert len(ret_vals) == len(checker.meshes) + 1
+    assert all(cached)
+    assert checker._results_cache is None
+
+
+def test_check5_check6_no_faces():
+    """Meshes without faces report nfaces as undefined from _check5 and _check6."""
+    dset = Dataset(adcircnc)
+    uchecker = UgridChecker()
+    uchecker.setup(dset)
+    try:
+        for mesh in uchecker.meshes:
+            uchecker._check2_connectivity_attrs(mesh)  # run the dependency
+            for check in (uchecker._check5_face_edge_conn, uchecker._check6_face_face_conn):
+                r = check(mesh)
+                assert r.value == (0, 0)
+                assert r.msgs == ["Number of faces (nfaces) not defined"]
+    finally:
+        dset.close()
+
+
+def test_check5_check6_no_maxnumnodesperface(checker):
+    """_check5 and _check6 are skipped when maxnumnodesperface is not a dimension."""
+    checker.ds.renameDimension("maxnumnodesperface", "notmaxnumnodesperface")
+    checker.setup(checker.ds)  # re-read the dimensions
+    for mesh in checker.meshes:
+        checker._check2_connectivity_attrs(mesh)  # run the dependency
+        for check in (checker._check5_face_edge_conn, checker._check6_face_face_conn):
+            r = check(mesh)
+            assert r.value == (0, 0)
+            assert r.msgs == []
+
+
+def test_check_results_not_memoized_outside_run(checker):
+    """Direct calls to a check always see the current state of the mesh."""
+    for mesh in checker.meshes:
+        r = checker._check1_topology_dim(mesh)
+        assert r.value[0] == r.value[1]
+        checker.meshes[mesh]["topology_dimension"] = None
+        r = checker._check1_topology_dim(mesh)
+        assert r.value[0] != r.value[1]
+
+
+def test_check_results_cache_dropped_on_error(checker, run_checks):
+    """A check raising during check_run leaves no cached results or extra mesh keys behind."""
+
+    def failing_check(mesh):
+        checker._check1_topology_dim(mesh)
+        raise KeyError(mesh.name)
+
+    keys = {mesh: set(meta) for mesh, meta in checker.meshes.items()}
+    with pytest.raises(KeyError):
+        run_checks(failing_check)
+    assert checker._results_cache is None
+    assert {mesh: set(meta) for mesh, meta in checker.meshes.items()} == keys
+
+
+def test_check_method_duplicate_order():
+    """Two checks registered with the same order are rejected at class creation."""
+    with pytest.raises(UgridExceptionError):
+
+        class DuplicateOrder(UgridChecker):
+            @check_method(order=1)
+            def _check_again(self, mesh):
+                pass
+
+
+def test_check_method_unknown_requires():
+    """A check requiring an order no check is registered with is rejected at class creation."""
+    with pytest.raises(UgridExceptionError):
+
+        class UnknownRequires(UgridChecker):
+            @check_method(order=7, requires=(99,))
+            def _check7(self, mesh):
+                pass
+
+
+def test_check_method_passes_failed_requirement(checker):
+    """check_method hands a check the result of its failed requirement."""
+
+    class WithRequirement(UgridChecker):
+        @check_method(order=7, requires=(1,))
+        def _check7(self, mesh, failed_requirement=None):  # noqa: ARG002
+            return failed_requirement
+
+    uchecker = WithRequirement()
+    uchecker.setup(checker.ds)
+    for mesh in uchecker.meshes:
+        assert uchecker._check7(mesh) is None
+        uchecker.meshes[mesh]["topology_dimension"] = None
+        assert uchecker._check7(mesh).value == (0, 1)